@@ -19,9 +19,15 @@ where
     fn available_pipe(&mut self, pipe: &mut u8) -> Result<bool, Self::Error> {
         if self.available()? {
             // RX FIFO is not empty
-            // get last used pipe
-            self.spi_read(0, commands::NOP)?;
-            *pipe = self.status.rx_pipe();
+            // get last used pipe from the STATUS byte latched by reading FIFO_STATUS
+            let mut rx_pipe = self.status.rx_pipe();
+            if rx_pipe > 5 {
+                // STATUS was clocked out before FIFO_STATUS, so a payload that
+                // arrived in between is not reflected yet; read STATUS again
+                self.spi_read(0, commands::NOP)?;
+                rx_pipe = self.status.rx_pipe();
+            }
+            *pipe = rx_pipe;
             return Ok(true);
         }
         Ok(false)
@@ -81,10 +87,12 @@ mod test {
         let spi_expectations = spi_test_expects![
             // read FIFO register value, but with empty RX FIFO_STATUS
             (vec![registers::FIFO_STATUS, 0u8], vec![0xEu8, 1u8]),
-            // do it again, but with occupied RX FIFO
-            (vec![registers::FIFO_STATUS, 1u8], vec![0xEu8, 2u8]),
-            // read STATUS register value
-            (vec![commands::NOP], vec![0xEu8]),
+            // do it again, but with occupied RX FIFO (pipe 1 in latched STATUS)
+            (vec![registers::FIFO_STATUS, 1u8], vec![2u8, 2u8]),
+            // occupied RX FIFO, but payload arrived after STATUS was latched
+            (vec![registers::FIFO_STATUS, 2u8], vec![0xEu8, 2u8]),
+            // read STATUS register value again (pipe 2)
+            (vec![commands::NOP], vec![4u8]),
         ];
         let mocks = mk_radio(&[], &spi_expectations);
         let (mut radio, mut spi, mut ce_pin) = (mocks.0, mocks.1, mocks.2);
@@ -92,7 +100,9 @@ mod test {
         assert!(!radio.available_pipe(&mut pipe).unwrap());
         assert_eq!(pipe, 9);
         assert!(radio.available_pipe(&mut pipe).unwrap());
-        assert_eq!(pipe, 7);
+        assert_eq!(pipe, 1);
+        assert!(radio.available_pipe(&mut pipe).unwrap());
+        assert_eq!(pipe, 2);
         spi.done();
         ce_pin.done();
     }
@@ -12,13 +12,31 @@ from mkdocs.structure.pages import Page
 from mkdocs.structure.files import Files
 from mkdocs.config.defaults import MkDocsConfig
 
-DEFINED_IN_PATTERN = re.compile(r"^Defined in: index\.d\.ts\:\d+\n\n", re.MULTILINE)
-SECTIONS_PATTERN = re.compile(
-    r"#+ (Parameters|Returns|Throws|Default Value|\wet Signature)"
+# All transformations applied to every TypeDoc page, combined into one pattern
+# so the markdown is only scanned once.
+TYPEDOC_PATTERN = re.compile(
+    # "***" lines (equivalent to a `<hr> element`)
+    r"(?P<divider>\*\*\*\n\n)"
+    # "Defined in" sections
+    r"|(?P<defined_in>^Defined in: index\.d\.ts\:\d+\n\n)"
+    # repeated section headers
+    r"|#+ (?P<section>Parameters|Returns|Throws|Default Value|\wet Signature)"
+    # signatures' code blocks
+    r"|(?P<ts_block>```ts)",
+    re.MULTILINE,
 )
-LIST_MARKER_PATTERN = re.compile("^• ", re.MULTILINE)
 GROUP_API_PATTERN = re.compile(r"^## \w+\s*$", re.MULTILINE)
-DIVIDER = re.compile(r"\*\*\*\n\n", re.MULTILINE)
+
+
+def _sanitize_typedoc(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    if kind == "section":
+        # replace with <strong> elements
+        return f"**{match.group(kind)}**"
+    if kind == "ts_block":
+        # remove copy button from all signatures
+        return "``` { .ts .no-copy }"
+    return ""  # remove dividers and "Defined in" sections
 
 
 def on_page_markdown(
@@ -28,15 +46,11 @@ def on_page_markdown(
         return markdown
     # change edit_uri metadata since these files are generated.
     page.edit_url = f"{config.repo_url}/{config.edit_uri}typedoc.json"
-    # remove all "***" lines (equivalent to a `<hr> element`)
-    markdown = DIVIDER.sub("", markdown)
-    # remove all "Defined in" sections
-    markdown = DEFINED_IN_PATTERN.sub("", markdown)
-    # replace repeated section headers with <strong> elements
-    markdown = SECTIONS_PATTERN.sub("**\\1**", markdown)
-    # remove copy button from all signatures
-    markdown = markdown.replace("```ts", "``` { .ts .no-copy }")
-    markdown = LIST_MARKER_PATTERN.sub("- ", markdown)
+    markdown = TYPEDOC_PATTERN.sub(_sanitize_typedoc, markdown)
+    # replace list markers (at the start of lines only)
+    if markdown.startswith("• "):
+        markdown = "- " + markdown[2:]
+    markdown = markdown.replace("\n• ", "\n- ")
     if page.file.src_path != "node-api/classes/RF24.md":
         return markdown
     # Now rearrange the grouped API of the RF24 class.
@@ -44,31 +58,16 @@ def on_page_markdown(
     # 1. Basic
     # 2. Advanced
     # 3. Configuration
-    result = ""
-    basic_api_span = []
-    advanced_api_span = []
-    configure_api_span = []
-    for index, match in enumerate(GROUP_API_PATTERN.finditer(markdown)):
-        if index == 0:
-            result += markdown[: match.start()]
-        if "Basic" in match.group(0):
-            basic_api_span.append(match.start())
-            advanced_api_span.append(match.start())
-        elif "Advanced" in match.group(0):
-            advanced_api_span.append(match.start())
-        elif "Configuration" in match.group(0):
-            basic_api_span.append(match.start())
-            configure_api_span.extend([match.start(), len(markdown)])
-    result += markdown[basic_api_span[0] : basic_api_span[1]].replace(
-        "## Basic", "## Basic API", 1
-    )
-    result += markdown[advanced_api_span[0] : advanced_api_span[1]].replace(
-        "## Advanced", "## Advanced API", 1
-    )
-    result += markdown[configure_api_span[0] : configure_api_span[1]].replace(
-        "## Configuration", "## Configuration API", 1
-    )
-    return result
+    matches = list(GROUP_API_PATTERN.finditer(markdown))
+    ends = [match.start() for match in matches[1:]] + [len(markdown)]
+    groups = {
+        match.group(0).split()[1]: markdown[match.start() : end]
+        for match, end in zip(matches, ends)
+    }
+    parts = [markdown[: matches[0].start()]]
+    for name in ("Basic", "Advanced", "Configuration"):
+        parts.append(groups[name].replace(f"## {name}", f"## {name} API", 1))
+    return "".join(parts)
 
 
 def on_page_content(html: str, page: Page, config: MkDocsConfig, files: Files) -> str:
@@ -13,28 +13,23 @@ which requires a Linux to compile.
 """
 
 import ast
+import functools
 import platform
-from typing import cast
-from types import ModuleType
 import griffe
-import importlib
-import logging
 from mkdocs.utils import log
 
-LOGGER = logging.getLogger("pyo3_merge_native_docs")
-LOGGER.setLevel(log.getEffectiveLevel())
-
 
 def elide_signature_from_docstring(docstring: str) -> str:
-    lines = docstring.splitlines()
-    start = 0
-    for index, line in enumerate(lines):
-        # pyo3 delimits the signature with a `\n--\n`
-        # pybind11 delimits the signature(s) with a blank line
-        if line.startswith("--"):
-            start = index + 1
-            break
-    return "\n".join(lines[start:])
+    # pyo3 delimits the signature with a `\n--\n`
+    index = docstring.find("\n--\n")
+    if index >= 0:
+        # also skip the blank line(s) that follow the delimiter
+        return docstring[index + 4 :].lstrip("\n")
+    # pybind11 delimits the signature(s) with a blank line
+    index = docstring.find("\n\n")
+    if index >= 0:
+        return docstring[index + 2 :]
+    return docstring
 
 
 def inject_docstring(node: ast.FunctionDef | ast.ClassDef, native_doc: str):
@@ -42,44 +37,97 @@ def inject_docstring(node: ast.FunctionDef | ast.ClassDef, native_doc: str):
 
     Tested only with ClassDef and FunctionDef AST nodes.
     """
-    if native_doc.startswith(f"{node.name}("):
-        native_doc = elide_signature_from_docstring(native_doc)
-    docstring = ast.get_docstring(node)
-    if docstring is None:
-        new_node = ast.Constant(native_doc)
-        ast.copy_location(new_node, node)
-        wrapper_node = ast.Expr(new_node)
-        ast.copy_location(wrapper_node, node)
-        node.body.insert(0, wrapper_node)
-    elif cast(ast.Constant, cast(ast.Expr, node.body[0]).value).value != native_doc:
-        cast(ast.Constant, cast(ast.Expr, node.body[0]).value).value = (
-            native_doc + docstring
+    first = node.body[0] if node.body else None
+    if (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+    ):
+        if first.value.value != native_doc:
+            first.value.value = native_doc + first.value.value
+    else:
+        # use the parent node's starting position for the injected nodes
+        lineno, col_offset = (node.lineno, node.col_offset)
+        new_node = ast.Constant(
+            native_doc,
+            lineno=lineno,
+            col_offset=col_offset,
+            end_lineno=lineno,
+            end_col_offset=col_offset,
         )
+        wrapper_node = ast.Expr(
+            new_node,
+            lineno=lineno,
+            col_offset=col_offset,
+            end_lineno=lineno,
+            end_col_offset=col_offset,
+        )
+        node.body.insert(0, wrapper_node)
+
+
+def get_native_doc(name: str, obj: object) -> str:
+    """Get the docstring of a native `obj` with its signature elided."""
+    doc = obj.__doc__ or ""
+    if doc.startswith(f"{name}("):
+        return elide_signature_from_docstring(doc)
+    return doc
+
+
+@functools.cache
+def load_native_docs(mod: str) -> tuple[dict[str, str], dict[str, dict[str, str]]]:
+    """Get the docstrings (without signatures) in the native module.
+
+    Returns 2 maps:
+
+    1. module members' names to their docstring
+    2. class names to a map of the class members' names to their docstring
+
+    The native module does not change during a process' lifetime,
+    so this is only done once (even if the extension is reinstantiated)."""
+    import importlib
+
+    native = importlib.import_module(mod)
+    docs: dict[str, str] = {}
+    members: dict[str, dict[str, str]] = {}
+    for name in dir(native):
+        if name.startswith("_"):
+            continue
+        obj = getattr(native, name)
+        docs[name] = get_native_doc(name, obj)
+        if isinstance(obj, type):
+            members[name] = {
+                member: get_native_doc(member, getattr(obj, member))
+                for member in dir(obj)
+                if not member.startswith("_") or member == "__init__"
+            }
+    return docs, members
 
 
 class NativeDocstring(griffe.Extension):
     def __init__(self):
         self.mod = "rf24_py"
-        self.native = importlib.import_module(self.mod)
+        self.is_linux = platform.system() == "Linux"
 
-    def try_get_attr(
-        self,
-        parent: ModuleType | ast.ClassDef | ast.Module,
-        member: str,
-        child_member: str | None = None,
-    ):
-        try:
-            return getattr(parent, member)
-        except AttributeError as exc:
-            if platform.system() == "Linux":
-                raise exc
-            domain = self.mod if isinstance(parent, ModuleType) else parent.name  # type: ignore[union-attr]
-            sibling = member
-            if child_member:
-                domain = member
-                sibling += "." + child_member
-            log.warning("%s has no member %s", domain, sibling)
+    def try_get_doc(self, name: str, member: str | None = None) -> str | None:
+        # the native module is only imported when a stub is first visited
+        docs, members = load_native_docs(self.mod)
+        if member is None:
+            doc = docs.get(name)
+            domain, sibling = (self.mod, name)
+        elif name not in members:
+            if self.is_linux:
+                raise AttributeError(f"{self.mod} has no member {name}")
+            # The missing class was already reported when its stub was visited.
+            # Don't warn again for each of its members.
             return None
+        else:
+            doc = members[name].get(member)
+            domain, sibling = (name, member)
+        if doc is None:
+            if self.is_linux:
+                raise AttributeError(f"{domain} has no member {sibling}")
+            log.warning("%s has no member %s", domain, sibling)
+        return doc
 
     def on_class_node(  # type: ignore[override]
         self,
@@ -89,10 +137,7 @@ class NativeDocstring(griffe.Extension):
         """Prepend a docstring from the native module"""
         if isinstance(node, griffe.ObjectNode):
             return  # any docstring fetched from pure python should be adequate
-        native = self.try_get_attr(self.native, node.name)
-        if native is None:
-            return
-        native_doc = native.__doc__
+        native_doc = self.try_get_doc(node.name)
         if not native_doc:
             return
         # print(f"Amending docstring for rf24_py.{node.name}")
@@ -106,27 +151,22 @@ class NativeDocstring(griffe.Extension):
         """Prepend a docstring from the native module"""
         if isinstance(node, griffe.ObjectNode):
             return  # any docstring fetched from pure python should be adequate
-        func_parent = node.parent  # type: ignore[attr-defined,union-attr]
-        if not (
-            isinstance(func_parent, ast.ClassDef) or isinstance(func_parent, ast.Module)
+        if node.decorator_list and not any(
+            isinstance(dec, ast.Name) and dec.id == "property"
+            for dec in node.decorator_list
         ):
+            return  # class property setters are not used for the docstring
+        func_parent = node.parent  # type: ignore[attr-defined,union-attr]
+        # ast node types are never subclassed, so compare exact types
+        parent_type = type(func_parent)
+        if parent_type is ast.ClassDef:
+            native_doc = self.try_get_doc(func_parent.name, node.name)
+        elif parent_type is ast.Module:
+            native_doc = self.try_get_doc(node.name)
+        else:
             return  # we're only concerned with class methods or module-scoped functions
-        native_obj = None
-        if isinstance(func_parent, ast.ClassDef):
-            native_cls = self.try_get_attr(self.native, func_parent.name, node.name)
-            if native_cls is not None:
-                native_obj = self.try_get_attr(native_cls, node.name)
-        elif isinstance(func_parent, ast.Module):
-            native_obj = self.try_get_attr(self.native, node.name)
-        if native_obj is None:
+        if native_doc is None:
             return
-        native_doc: str = native_obj.__doc__ or ""
-        if node.decorator_list:
-            for dec in node.decorator_list:
-                if isinstance(dec, ast.Name) and dec.id == "property":
-                    break
-            else:
-                return  # class property setters are not used for the docstring
         if node.name == "__init__":
             # remove the default docstring from pyo3 (intended for `help()`)
             native_doc = native_doc.replace(
@@ -0,0 +1,101 @@
+"""
+Code shared by the python examples: the hardware setup used by the examples that
+are meant to be run on 2 separate nRF24L01 transceivers, and the prompt used
+to select an example's role.
+
+This module is not an example itself.
+
+See documentation at https://nRF24.github.io/rf24-rs
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+from rf24_py import RF24, PaLevel
+
+# The radio's CE Pin uses a GPIO number.
+CE_PIN = 22  # for GPIO22
+
+# The radio's CSN Pin corresponds the SPI bus's CS pin (aka CE pin).
+# On Linux, consider the device path `/dev/spidev<a>.<b>`:
+#   - `<a>` is the SPI bus number (defaults to `0`)
+#   - `<b>` is the CSN pin (must be unique for each device on the same SPI bus)
+CSN_PIN = 0  # aka CE0 for SPI bus 0 (/dev/spidev0.0)
+
+# For these examples, we will use different addresses
+# An address need to be a buffer protocol object (bytearray)
+ADDRESSES = (b"1Node", b"2Node")
+# It is very helpful to think of an address as a path instead of as
+# an identifying device destination
+
+
+def ask_radio_number() -> bool:
+    """Prompt the user for this radio's number.
+
+    Anything other than ``1`` (including no input) selects radio 0.
+    """
+    prompt = "Which radio is this? Enter '0' or '1'. Defaults to '0' "
+    return input(prompt).strip() == "1"
+
+
+def make_radio(radio_number: bool, payload_length: Optional[int] = None) -> RF24:
+    """Create a radio object, initialize it, and open the pipes for
+    communicating with the other radio.
+
+    :param bool radio_number: Uniquely identifies which address this radio will
+        use to transmit. 0 uses ``ADDRESSES[0]`` to transmit, 1 uses
+        ``ADDRESSES[1]`` to transmit.
+    :param int payload_length: The static payload length to use. If not provided,
+        then the radio's default (32 bytes) is kept.
+    """
+    # create a radio object for the specified hardware config:
+    radio = RF24(CE_PIN, CSN_PIN)
+
+    # initialize the nRF24L01 on the spi bus
+    radio.begin()
+
+    # set the Power Amplifier level to -12 dBm since these examples are
+    # usually run with nRF24L01 transceivers in close proximity of each other
+    radio.pa_level = PaLevel.Low  # PaLevel.Max is default
+
+    # set TX address of RX node (always uses pipe 0)
+    radio.as_tx(ADDRESSES[radio_number])  # enter inactive TX mode
+
+    # set RX address of TX node into an RX pipe
+    radio.open_rx_pipe(1, ADDRESSES[not radio_number])  # using pipe 1
+
+    if payload_length is not None:
+        # To save time during transmission, we'll set the payload size to be
+        # only what we need.
+        radio.payload_length = payload_length
+
+    return radio
+
+
+def run_role(
+    radio: RF24, prompt: str, roles: Dict[str, Tuple[Callable[..., None], int]]
+) -> bool:
+    """Prompt the user for a role and run it.
+
+    The first letter of the user's input selects the role, and any following
+    space-delimited numbers are passed to the role's method as (int) arguments
+    (e.g. 'R 10' calls ``rx(10)``). Entering 'Q' powers down the ``radio``.
+
+    :param RF24 radio: The radio to power down when the user quits.
+    :param str prompt: The instructions shown to the user.
+    :param dict roles: Maps each role's (upper case) letter to a method and the
+        max number of (int) args it takes.
+
+    :return:
+        - True when role is complete & app should continue running.
+        - False when app should exit
+    """
+    user_input = (input(prompt) or "?").split()
+    role = user_input[0][:1].upper()
+    if role == "Q":
+        radio.power = False
+        return False
+    if role not in roles:
+        print(user_input[0], "is an unrecognized input. Please try again.")
+        return True
+    handler, max_args = roles[role]
+    handler(*[int(x) for x in user_input[1 : 1 + max_args]])
+    return True
@@ -8,42 +8,17 @@ See documentation at https://nRF24.github.io/rf24-rs
 """
 
 import time
-from rf24_py import RF24, PaLevel
+from _common import ask_radio_number, make_radio, run_role
 
 
 class App:
     def __init__(self) -> None:
-        # The radio's CE Pin uses a GPIO number.
-        ce_pin = 22  # for GPIO22
-
-        # The radio's CSN Pin corresponds the SPI bus's CS pin (aka CE pin).
-        # On Linux, consider the device path `/dev/spidev<a>.<b>`:
-        #   - `<a>` is the SPI bus number (defaults to `0`)
-        #   - `<b>` is the CSN pin (must be unique for each device on the same SPI bus)
-        csn_pin = 0  # aka CE0 for SPI bus 0 (/dev/spidev0.0)
-
-        # create a radio object for the specified hardware config:
-        self.radio = RF24(ce_pin, csn_pin)
-
-        # For this example, we will use different addresses
-        # An address need to be a buffer protocol object (bytearray)
-        address = [b"1Node", b"2Node"]
-        # It is very helpful to think of an address as a path instead of as
-        # an identifying device destination
-
         # to use different addresses on a pair of radios, we need a variable to
         # uniquely identify which address this radio will use to transmit
-        # 0 uses address[radio_number] to transmit, 1 uses address[not radio_number] to transmit
-        radio_number = bool(
-            int(input("Which radio is this? Enter '0' or '1'. Defaults to '0' ") or 0)
-        )
+        radio_number = ask_radio_number()
 
-        # initialize the nRF24L01 on the spi bus
-        self.radio.begin()
-
-        # set the Power Amplifier level to -12 dBm since this test example is
-        # usually run with nRF24L01 transceivers in close proximity of each other
-        self.radio.pa_level = PaLevel.Low  # PaLevel.Max is default
+        # create and configure the radio object
+        self.radio = make_radio(radio_number)
 
         # ACK payloads are dynamically sized, so we need to enable that feature also
         self.radio.dynamic_payloads = True
@@ -51,14 +26,12 @@ class App:
         # to enable the custom ACK payload feature
         self.radio.ack_payloads = True
 
-        # set TX address of RX node (always uses pipe 0)
-        self.radio.as_tx(address[radio_number])  # enter inactive TX mode
-
-        # set RX address of TX node into an RX pipe
-        self.radio.open_rx_pipe(1, address[not radio_number])  # using pipe 1
-
         self.counter = 0
 
+        # reusable payload buffers (the last byte is the counter)
+        self.tx_buffer = bytearray(b"Hello \x00\x00")
+        self.ack_buffer = bytearray(b"World \x00\x00")
+
         # for debugging
         # self.radio.print_details()
 
@@ -68,7 +41,8 @@ class App:
 
         while count:
             # construct a payload to send
-            buffer = b"Hello \x00" + bytes([self.counter])
+            buffer = self.tx_buffer
+            buffer[7] = self.counter
 
             # send the payload and prompt
             start_timer = time.monotonic_ns()  # start timer
@@ -85,9 +59,7 @@ class App:
                 if self.radio.available():
                     # print the received ACK that was automatically sent
                     response = self.radio.read()
-                    print(
-                        f" Received: {response[:6].decode('utf-8')}{response[7:8][0]}"
-                    )
+                    print(f" Received: {response[:6].decode('utf-8')}{response[7]}")
                     self.counter += 1  # increment payload counter
                 else:
                     print(" Received an empty ACK packet")
@@ -104,7 +76,8 @@ class App:
         self.radio.as_rx()  # put radio into RX mode, power it up
 
         # setup the first transmission's ACK payload
-        buffer = b"World \x00" + bytes([self.counter])
+        buffer = self.ack_buffer
+        buffer[7] = self.counter
         # we must set the ACK payload data and corresponding
         # pipe number [0,5]
         self.radio.write_ack_payload(1, buffer)  # load ACK for first response
@@ -116,15 +89,15 @@ class App:
                 received = self.radio.read()  # fetch 1 payload from RX FIFO
                 print(
                     f"Received {len(received)} bytes on pipe {pipe_number}:",
-                    f"{received[:6].decode('utf-8')}{received[7:8][0]} Sent:",
+                    f"{received[:6].decode('utf-8')}{received[7]} Sent:",
                     f"{buffer[:6].decode('utf-8')}{self.counter}",
                 )
                 end_time = time.monotonic() + timeout  # reset timer
 
                 # increment counter from received payload
-                self.counter = received[7:8][0] + 1
+                self.counter = received[7] + 1
                 # build a new ACK payload
-                buffer = b"World \x00" + bytes([self.counter])
+                buffer[7] = self.counter
                 self.radio.write_ack_payload(1, buffer)  # load ACK for next response
 
         # recommended behavior is to keep in TX mode while idle
@@ -140,26 +113,18 @@ class App:
             - True when role is complete & app should continue running.
             - False when app should exit
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'R' for receiver role.\n"
                 "*** Enter 'T' for transmitter role.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
+            ),
+            {
+                "R": (self.rx, 1),
+                "T": (self.tx, 1),
+            },
         )
-        user_input = user_input.split()
-        if user_input[0].upper().startswith("R"):
-            self.rx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("T"):
-            self.tx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 This example uses the nRF24L01 as a 'fake' BLE Beacon
 """
 
+import sys
 import time
 from rf24_py import (
     RF24,
@@ -13,11 +14,7 @@ from rf24_py import (
     PaLevel,
     FifoState,
 )
-
-
-def _prompt(remaining):
-    if remaining and (remaining % 5 == 0 or remaining < 5):
-        print(remaining, "advertisements left to go!")
+from _common import run_role
 
 
 class App:
@@ -49,6 +46,25 @@ class App:
         # for debugging
         # self.radio.print_details()
 
+    def _beacon_loop(self, buffer: bytes, count: int, interval: float = 0.5):
+        """Advertise the `buffer` `count` times (1 per `interval` seconds)"""
+        send, hop_channel = (self.ble.send, self.ble.hop_channel)
+        monotonic, sleep = (time.monotonic, time.sleep)
+        # the remaining counts at which progress is reported
+        prompt_at = frozenset([*range(1, 5), *range(5, count + 1, 5)])
+        start = monotonic()
+        for i in range(count):
+            remaining = count - i
+            if remaining in prompt_at:
+                print(remaining, "advertisements left to go!")
+            send(buffer)
+            hop_channel()
+            # sleep until the next scheduled advertisement, so the time spent
+            # sending doesn't accumulate into the advertising interval
+            delay = start + (i + 1) * interval - monotonic()
+            if delay > 0:
+                sleep(delay)
+
     def tx_battery(self, count: int = 50):
         """Transmits a battery charge level as a BLE beacon"""
         self.radio.as_tx()  # ensures the nRF24L01 is in TX mode
@@ -65,11 +81,7 @@ class App:
             self.ble.len_available(buffer),
         )
 
-        for i in range(count, 0, -1):
-            _prompt(i)
-            self.ble.send(buffer)
-            self.ble.hop_channel()
-            time.sleep(0.5)
+        self._beacon_loop(buffer, count)
 
         # disable these features when done (for example purposes)
         self.ble.name = None
@@ -93,11 +105,7 @@ class App:
             self.ble.len_available(buffer),
         )
 
-        for i in range(count, 0, -1):
-            _prompt(i)
-            self.ble.send(buffer)
-            self.ble.hop_channel()
-            time.sleep(0.5)
+        self._beacon_loop(buffer, count)
 
         # disable these features when done (for example purposes)
         self.ble.name = None
@@ -119,11 +127,7 @@ class App:
             self.ble.len_available(buffer),
         )
 
-        for i in range(count, 0, -1):
-            _prompt(i)
-            self.ble.send(buffer)
-            self.ble.hop_channel()
-            time.sleep(0.5)
+        self._beacon_loop(buffer, count)
 
         # recommended behavior is to keep in TX mode while idle
         self.radio.as_tx()  # enter inactive TX mode
@@ -133,35 +137,37 @@ class App:
         after 6 seconds of no received transmission."""
         self.radio.as_rx()  # put radio into RX mode
 
-        end_time = time.monotonic() + timeout
-        while (
-            time.monotonic() < end_time
-            or self.radio.get_fifo_state(False) != FifoState.Empty
-        ):
-            if self.radio.available():
-                # fetch 1 payload from RX FIFO
-                received = self.ble.read()
-                if received is not None:
-                    mac = ":".join(["%02X" % x for x in received.mac_address])
-                    print("Received payload from MAC address", mac)
-                    if received.short_name:
-                        print("\tDevice name:", received.short_name)
-                    if received.tx_power is not None:
-                        print("\tTX power:", received.tx_power, "dBm")
-                    if received.battery_charge:
-                        print(
-                            f"\tRemaining battery charge: {received.battery_charge.data}%"
-                        )
-                    if received.temperature:
-                        print(
-                            f"\tTemperature measurement: {received.temperature.data} C"
-                        )
-                    if received.url:
-                        print("\tURL:", received.url.data)
-            if time.monotonic() >= end_time:
-                # recommended behavior is to keep in TX mode while idle
-                self.radio.as_tx()  # enter inactive TX mode (exit RX mode)
-                # continue to read remaining payloads from RX FIFO
+        end_time = time.monotonic_ns() + timeout * 1_000_000_000
+        while time.monotonic_ns() < end_time:
+            if self.radio.get_fifo_state(False) != FifoState.Empty:
+                self._print_payload()
+
+        # recommended behavior is to keep in TX mode while idle
+        self.radio.as_tx()  # enter inactive TX mode (exit RX mode)
+
+        # read remaining payloads from RX FIFO
+        while self.radio.get_fifo_state(False) != FifoState.Empty:
+            self._print_payload()
+
+    def _print_payload(self):
+        """Fetch 1 payload from RX FIFO and print its details (if it is valid)"""
+        received = self.ble.read()
+        if received is None:
+            return
+        # report the payload's details with a single write to stdout
+        mac = received.mac_address.hex(":").upper()
+        lines = [f"Received payload from MAC address {mac}"]
+        if received.short_name:
+            lines.append(f"\tDevice name: {received.short_name}")
+        if received.tx_power is not None:
+            lines.append(f"\tTX power: {received.tx_power} dBm")
+        if received.battery_charge:
+            lines.append(f"\tRemaining battery charge: {received.battery_charge.data}%")
+        if received.temperature:
+            lines.append(f"\tTemperature measurement: {received.temperature.data} C")
+        if received.url:
+            lines.append(f"\tURL: {received.url.data}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def set_role(self):
         """Set the role using stdin stream. Timeout arg for slave() can be
@@ -171,34 +177,22 @@ class App:
             - True when role is complete & app should continue running.
             - False when app should exit
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'R' for receiver role.\n"
                 "*** Enter 'T' to transmit a temperature measurement.\n"
                 "*** Enter 'B' to transmit a battery charge level.\n"
                 "*** Enter 'U' to transmit a URL.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
+            ),
+            {
+                "R": (self.rx, 1),
+                "T": (self.tx_temperature, 1),
+                "B": (self.tx_battery, 1),
+                "U": (self.tx_url, 1),
+            },
         )
-        user_input = user_input.split()
-        if user_input[0].upper().startswith("R"):
-            self.rx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("T"):
-            self.tx_temperature(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("B"):
-            self.tx_battery(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("U"):
-            self.tx_url(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
 
 
 if __name__ == "__main__":
@@ -5,16 +5,21 @@ nRF24L01.
 This example is meant to be run on 2 separate nRF24L01 transceivers.
 
 This example requires gpiod lib to monitor the radio's IRQ pin.
+Both roles use the IRQ pin: the transmitting role tests each IRQ event,
+and the receiving role configures the IRQ pin for only the "data ready" event
+to wait for payloads without polling the radio.
 
 See documentation at https://nRF24.github.io/rf24-rs
 """
 
 import time
-from rf24_py import RF24, PaLevel, FifoState, StatusFlags
+from rf24_py import StatusFlags, FifoState
+from _common import ask_radio_number, make_radio, run_role
 
 try:
     import gpiod  # type: ignore[import-untyped,import-not-found]
     from gpiod.line import Edge  # type: ignore[import-untyped,import-not-found]
+    from gpiod.edge_event import EdgeEvent  # type: ignore[import-untyped,import-not-found]
 except ImportError as exc:
     raise ImportError(
         "This script requires gpiod installed for observing the IRQ pin. Please run\n"
@@ -22,23 +27,35 @@ except ImportError as exc:
         "details at https://pypi.org/project/gpiod/"
     ) from exc
 
+FALLING_EDGE = EdgeEvent.Type.FALLING_EDGE
 
-class App:
-    def __init__(self) -> None:
-        # The radio's CE Pin uses a GPIO number.
-        ce_pin = 22  # for GPIO22
 
-        # The radio's CSN Pin corresponds the SPI bus's CS pin (aka CE pin).
-        # On Linux, consider the device path `/dev/spidev<a>.<b>`:
-        #   - `<a>` is the SPI bus number (defaults to `0`)
-        #   - `<b>` is the CSN pin (must be unique for each device on the same SPI bus)
-        csn_pin = 0  # aka CE0 for SPI bus 0 (/dev/spidev0.0)
+class App:
+    #: the (name, StatusFlags attribute) of the event tested by each phase of tx()
+    _PHASES = (("data ready", "rx_dr"), ("data sent", "tx_ds"), ("data fail", "tx_df"))
+
+    # IRQ pin configurations used by tx() and rx().
+    # StatusFlags objects are read-only, so they can be shared between calls.
+    _IRQ_NO_TX_DS = StatusFlags(rx_dr=True, tx_ds=False, tx_df=True)
+    _IRQ_NO_RX_DR = StatusFlags(rx_dr=False, tx_ds=True, tx_df=True)
+    _IRQ_RX_DR_ONLY = StatusFlags(rx_dr=True, tx_ds=False, tx_df=False)
+    _IRQ_NONE = StatusFlags()
+    _IRQ_ALL = StatusFlags(rx_dr=True, tx_ds=True, tx_df=True)
+    #: the status flags cleared by rx() for each IRQ event
+    _CLEAR_RX_DR = StatusFlags(rx_dr=True)
+
+    #: the payloads transmitted by tx() (1 for each step)
+    _TX_PAYLOADS = (b"Ping ", b"Pong ", b"Radio", b"1FAIL")
+    #: the ACK payloads loaded by rx() (1 for each payload expected from tx())
+    _ACK_PAYLOADS = (b"Yak ", b"Back", b" ACK")
 
-        # create a radio object for the specified hardware config:
-        self.radio = RF24(ce_pin, csn_pin)
+    def __init__(self) -> None:
+        # to use different addresses on a pair of radios, we need a variable to
+        # uniquely identify which address this radio will use to transmit
+        radio_number = ask_radio_number()
 
-        # initialize the nRF24L01 on the spi bus
-        self.radio.begin()
+        # create and configure the radio object
+        self.radio = make_radio(radio_number)
 
         gpio_chip = 0  # change this number as needed (according to your system)
         chip = gpiod.Chip(f"/dev/gpiochip{gpio_chip}")
@@ -56,34 +73,11 @@ class App:
             config={self.irq_pin: gpiod.LineSettings(edge_detection=Edge.FALLING)},
         )
 
-        # For this example, we will use different addresses
-        # An address need to be a buffer protocol object (bytearray)
-        address = [b"1Node", b"2Node"]
-        # It is very helpful to think of an address as a path instead of as
-        # an identifying device destination
-
-        # to use different addresses on a pair of radios, we need a variable to
-        # uniquely identify which address this radio will use to transmit
-        # 0 uses address[0] to transmit, 1 uses address[1] to transmit
-        radio_number = bool(
-            int(input("Which radio is this? Enter '0' or '1'. Defaults to '0' ") or 0)
-        )
-
-        # set TX address of RX node (always uses pipe 0)
-        self.radio.as_tx(address[radio_number])  # enter inactive TX mode
-
-        # set RX address of TX node into an RX pipe
-        self.radio.open_rx_pipe(1, address[not radio_number])  # using pipe 1
-
         # this example uses the ACK payload to trigger the IRQ pin active for
         # the "on data received" event
         self.radio.ack_payloads = True  # enable ACK payloads
         self.radio.dynamic_payloads = True  # ACK payloads are dynamically sized
 
-        # set the Power Amplifier level to -12 dBm since this test example is
-        # usually run with nRF24L01 transceivers in close proximity of each other
-        self.radio.pa_level = PaLevel.Low  # PaLevel.Max is default
-
         # for debugging
         # self.radio.print_details()
 
@@ -98,12 +92,8 @@ class App:
         self.radio.update()
         flags: StatusFlags = self.radio.get_status_flags()  # update IRQ status flags
         print(f"\t{repr(flags)}")
-        if self.pl_iterator == 0:
-            print("'data ready' event test", ("passed" if flags.rx_dr else "failed"))
-        elif self.pl_iterator == 1:
-            print("'data sent' event test", ("passed" if flags.tx_ds else "failed"))
-        elif self.pl_iterator == 2:
-            print("'data fail' event test", ("passed" if flags.tx_df else "failed"))
+        name, attr = self._PHASES[self.pl_iterator]
+        print(f"'{name}' event test", ("passed" if getattr(flags, attr) else "failed"))
         self.radio.clear_status_flags()
 
     def _wait_for_irq(self, timeout: float = 5) -> bool:
@@ -114,14 +104,12 @@ class App:
         if not self.irq_line.wait_edge_events(timeout):
             print(f"\tInterrupt event not detected for {timeout} seconds!")
             return False
-        # read event from kernel buffer
-        for event in self.irq_line.read_edge_events():
-            if (
-                event.line_offset == self.irq_pin
-                and event.event_type is event.Type.FALLING_EDGE
-            ):
-                return True
-        return False
+        # read all events from kernel buffer, so none are left over to be
+        # mistaken for the next IRQ.
+        # Only the IRQ pin's line was requested, so there's no need to check
+        # the event's line offset.
+        events = self.irq_line.read_edge_events()
+        return any(event.event_type is FALLING_EDGE for event in events)
 
     def tx(self) -> None:
         """Transmits 4 times and reports results
@@ -133,13 +121,13 @@ class App:
         4. intentionally fail transmit on the fourth
         """
 
-        tx_payloads = (b"Ping ", b"Pong ", b"Radio", b"1FAIL")
+        tx_payloads = self._TX_PAYLOADS
 
         self.radio.as_tx()  # put radio in TX mode
 
         # on data ready test
         print("\nConfiguring IRQ pin to only ignore 'on data sent' event")
-        self.radio.set_status_flags(StatusFlags(rx_dr=True, tx_ds=False, tx_df=True))
+        self.radio.set_status_flags(self._IRQ_NO_TX_DS)
         print("    Pinging slave node for an ACK payload...")
         self.pl_iterator = 0
         if not self.radio.write(tx_payloads[0]):
@@ -149,7 +137,7 @@ class App:
 
         # on "data sent" test
         print("\nConfiguring IRQ pin to only ignore 'on data ready' event")
-        self.radio.set_status_flags(StatusFlags(rx_dr=False, tx_ds=True, tx_df=True))
+        self.radio.set_status_flags(self._IRQ_NO_RX_DR)
         print("    Pinging slave node again...")
         self.pl_iterator = 1
         if not self.radio.write(tx_payloads[1]):
@@ -160,7 +148,7 @@ class App:
         # trigger slave node to exit by filling the slave node's RX FIFO
         print("\nSending one extra payload to fill RX FIFO on slave node.")
         print("Disabling IRQ pin for all events.")
-        self.radio.set_status_flags(StatusFlags())
+        self.radio.set_status_flags(self._IRQ_NONE)
         if self.radio.send(tx_payloads[2]):
             print("Slave node should not be listening anymore.")
         else:
@@ -169,7 +157,7 @@ class App:
 
         # on "data fail" test
         print("\nConfiguring IRQ pin to go active for all events.")
-        self.radio.set_status_flags(StatusFlags(rx_dr=True, tx_ds=True, tx_df=True))
+        self.radio.set_status_flags(self._IRQ_ALL)
         print("    Sending a ping to inactive slave node...")
         self.radio.flush_tx()  # just in case any previous tests failed
         self.pl_iterator = 2
@@ -186,25 +174,43 @@ class App:
         self.radio.as_tx()  # enter inactive TX mode
 
     def rx(self, timeout=6):  # will listen for 6 seconds before timing out
-        """Only listen for 3 payload from the master node"""
+        """Only listen for 3 payload from the master node.
+
+        Unlike the other examples, this does not poll the radio while waiting.
+        The IRQ pin is configured to only go active for the "data ready" event,
+        and the RX FIFO is only checked when the IRQ pin goes active.
+        """
         # the "data ready" event will trigger in RX mode
         # the "data sent" or "data fail" events will trigger when we
         # receive with ACK payloads enabled (& loaded in TX FIFO)
-        print("\nDisabling IRQ pin for all events.")
-        self.radio.set_status_flags(StatusFlags())
+        print("\nConfiguring IRQ pin to only go active for the 'data ready' event.")
+        self.radio.set_status_flags(self._IRQ_RX_DR_ONLY)
         # fill TX FIFO with ACK payloads
-        ack_payloads = (b"Yak ", b"Back", b" ACK")
-        for ack in ack_payloads:
-            self.radio.write_ack_payload(1, ack)
+        write_ack_payload = self.radio.write_ack_payload
+        for ack in self._ACK_PAYLOADS:
+            write_ack_payload(1, ack)
+
+        # discard any stale events from the kernel buffer
+        while self.irq_line.wait_edge_events(0):
+            self.irq_line.read_edge_events()
 
         self.radio.as_rx()  # start listening & clear irq_dr flag
         end_time = time.monotonic() + timeout  # set end time
-        while (
-            self.radio.get_fifo_state(False) != FifoState.Full
-            and time.monotonic() < end_time
-        ):
-            # wait for RX FIFO to fill up or until timeout is reached
-            pass
+        # wait for RX FIFO to fill up or until timeout is reached.
+        # Blocking on the IRQ pin avoids polling the radio over SPI.
+        # An edge does not mean exactly 1 payload was received: the IRQ pin stays
+        # active until the "data ready" flag is cleared, so more payloads may have
+        # arrived in the meantime. Check the RX FIFO once per edge instead.
+        remaining = float(timeout)
+        while remaining > 0 and self.irq_line.wait_edge_events(remaining):
+            self.irq_line.read_edge_events()
+            # Release the IRQ pin for the next event. Only clear the "data ready"
+            # flag; the "data sent"/"data fail" flags from sending ACK payloads
+            # are left untouched.
+            self.radio.clear_status_flags(self._CLEAR_RX_DR)
+            if self.radio.get_fifo_state(False) == FifoState.Full:
+                break
+            remaining = end_time - time.monotonic()
         time.sleep(0.5)  # wait for last ACK payload to transmit
 
         # exit RX mode
@@ -226,25 +232,18 @@ class App:
             - True when role is complete & app should continue running.
             - False when app should exit
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'R' for receiver role.\n"
                 "*** Enter 'T' for transmitter role.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
-        ).split()
-        if user_input[0].upper().startswith("R"):
-            self.rx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("T"):
-            self.tx()
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
+            ),
+            {
+                "R": (self.rx, 1),
+                "T": (self.tx, 0),
+            },
+        )
 
 
 if __name__ == "__main__":
@@ -10,56 +10,19 @@ This example is meant to be run on 2 separate nRF24L01 transceivers.
 See documentation at https://nRF24.github.io/rf24-rs
 """
 
-import struct
 import time
-from rf24_py import RF24, PaLevel, StatusFlags
+from _common import ask_radio_number, make_radio, run_role
 
 
 class App:
     def __init__(self):
-        # The radio's CE Pin uses a GPIO number.
-        ce_pin = 22  # for GPIO22
-
-        # The radio's CSN Pin corresponds the SPI bus's CS pin (aka CE pin).
-        # On Linux, consider the device path `/dev/spidev<a>.<b>`:
-        #   - `<a>` is the SPI bus number (defaults to `0`)
-        #   - `<b>` is the CSN pin (must be unique for each device on the same SPI bus)
-        csn_pin = 0  # aka CE0 for SPI bus 0 (/dev/spidev0.0)
-
-        # create a radio object for the specified hardware config:
-        self.radio = RF24(ce_pin, csn_pin)
-
-        # For this example, we will use different addresses
-        # An address need to be a buffer protocol object (bytearray)
-        address = [b"1Node", b"2Node"]
-        # It is very helpful to think of an address as a path instead of as
-        # an identifying device destination
-
         # to use different addresses on a pair of radios, we need a variable to
         # uniquely identify which address this radio will use to transmit
-        # 0 uses address[radio_number] to transmit, 1 uses address[not radio_number] to transmit
-        radio_number = bool(
-            int(input("Which radio is this? Enter '0' or '1'. Defaults to '0' ") or 0)
-        )
-
-        # initialize the nRF24L01 on the spi bus
-        self.radio.begin()
+        radio_number = ask_radio_number()
 
-        # set the Power Amplifier level to -12 dBm since this test example is
-        # usually run with nRF24L01 transceivers in close proximity of each other
-        self.radio.pa_level = PaLevel.Low  # PaLevel.Max is default
-
-        # set TX address of RX node (always uses pipe 0)
-        self.radio.as_tx(address[radio_number])  # enter inactive TX mode
-
-        # set RX address of TX node into an RX pipe
-        self.radio.open_rx_pipe(1, address[not radio_number])  # using pipe 1
-
-        # To save time during transmission, we'll set the payload size to be only what
-        # we need.
-        # "<b" means a little endian unsigned byte
-        # we also need an addition 7 bytes for the payload message
-        self.radio.payload_length = struct.calcsize("<b") + 7
+        # create and configure the radio object.
+        # Each payload is 7 bytes of text followed by a single signed byte counter.
+        self.radio = make_radio(radio_number, 7 + 1)
 
         self.counter = 0
 
@@ -70,24 +33,27 @@ class App:
         """Transmits a message and an incrementing integer every second"""
         self.radio.as_tx()  # ensures the nRF24L01 is in TX mode
 
+        monotonic_ns = time.monotonic_ns
+        available = self.radio.available
+        # the payload's text is static; only its last byte (the counter) changes.
+        # NOTE we added a b"\x00" byte as a c-string's NULL terminating 0
+        buffer = bytearray(b"Hello \x00\x00")
+        next_tick = monotonic_ns()  # when to begin the next transmission
         while count:  # only transmit `count` packets
-            # use struct.pack() to pack your data into a usable payload
-            # "<b" means a single little endian unsigned byte.
-            # NOTE we added a b"\x00" byte as a c-string's NULL terminating 0
-            buffer = b"Hello \x00" + struct.pack("<b", self.counter)
-            start_timer = time.monotonic_ns()  # start timer
+            buffer[7] = self.counter & 0xFF
+            start_timer = monotonic_ns()  # start timer
             result = self.radio.send(buffer)
             if not result:
                 print("Transmission failed or timed out")
             else:
                 self.radio.as_rx()
                 got_response = False
-                timeout = time.monotonic() * 1000 + 200  # use 200 ms timeout
-                while time.monotonic() * 1000 < timeout:
-                    if self.radio.available():
+                deadline = monotonic_ns() + 200_000_000  # use 200 ms timeout
+                while monotonic_ns() < deadline:
+                    if available():
                         got_response = True
                         break
-                end_timer = time.monotonic_ns()  # end timer
+                end_timer = monotonic_ns()  # end timer
                 self.radio.as_tx()
                 print(
                     "Transmission successful. Sent: ",
@@ -101,16 +67,18 @@ class App:
                     # decode response's text as an string
                     # NOTE ack[:6] ignores the NULL terminating 0
                     response = ack[:6].decode("utf-8")
-                    # use struct.unpack() to get the response's appended int
-                    # NOTE ack[7:] discards NULL terminating 0, and
-                    # "<b" means its a single little endian unsigned byte
-                    counter = struct.unpack("<b", ack[7:])[0]
+                    # get the response's appended counter as a signed byte
+                    counter = ack[7] - 256 if ack[7] > 127 else ack[7]
                     print(
                         f"Received: {response}{counter}. Roundtrip delay:",
                         f"{(end_timer - start_timer) / 1000} us.",
                     )
                     self.counter += 1
-            time.sleep(1)  # make example readable by slowing down transmissions
+            # make example readable by slowing down transmissions (1 per second).
+            # Sleeping until a deadline keeps the pace steady regardless of how
+            # long the response took to arrive.
+            next_tick += 1_000_000_000
+            time.sleep(max(0, next_tick - monotonic_ns()) / 1_000_000_000)
             count -= 1
 
         # recommended behavior is to keep in TX mode while idle
@@ -121,33 +89,33 @@ class App:
         after 6 seconds of no received transmission"""
         self.radio.as_rx()  # put radio into RX mode and power up
 
-        end_time = time.monotonic() + timeout  # start a timer to detect timeout
-        while time.monotonic() < end_time:
+        monotonic_ns = time.monotonic_ns
+        available_pipe = self.radio.available_pipe
+        resend = self.radio.resend
+        # the response's text is static; only its last byte (the counter) changes.
+        # NOTE b"\x00" byte is a c-string's NULL terminating 0
+        buffer = bytearray(b"World \x00\x00")
+
+        timeout_ns = timeout * 1_000_000_000
+        end_time = monotonic_ns() + timeout_ns  # start a timer to detect timeout
+        while monotonic_ns() < end_time:
             # receive payloads or wait 6 seconds till timing out
-            has_payload, pipe_number = self.radio.available_pipe()
-            if has_payload:
+            has_payload, pipe_number = available_pipe()
+            while has_payload:  # handle every payload already in the RX FIFO
                 received = self.radio.read()  # fetch 1 payload from RX FIFO
-                # use struct.unpack() to get the payload's appended int
-                # NOTE received[7:] discards NULL terminating 0, and
-                # "<b" means its a single little endian unsigned byte
-                self.counter = struct.unpack("<b", received[7:])[0] + 1
-                # use bytes() to pack our data into a usable payload
-                # NOTE b"\x00" byte is a c-string's NULL terminating 0
-                buffer = b"World \x00" + bytes([self.counter])
+                # get the payload's appended counter as a signed byte
+                counter = received[7] - 256 if received[7] > 127 else received[7]
+                self.counter = counter + 1
+                buffer[7] = self.counter & 0xFF
 
                 self.radio.as_tx()  # set radio to TX mode
-                self.radio.write(buffer)  # load payload into radio's RX buffer
+                # send() and resend() block (in native code) until the radio
+                # reports either a successful or failed transmission
+                response_result = self.radio.send(buffer)
                 # keep retrying to send response for 150 milliseconds
-                response_timeout = time.monotonic_ns() + 150000000
-                response_result = False
-                while time.monotonic_ns() < response_timeout:
-                    self.radio.update()
-                    flags: StatusFlags = self.radio.get_status_flags()
-                    if flags.tx_ds:
-                        response_result = True
-                        break
-                    if flags.tx_df:
-                        self.radio.rewrite()
+                response_timeout = monotonic_ns() + 150000000
+                while not response_result and monotonic_ns() < response_timeout:
+                    response_result = resend()
                 self.radio.as_rx()  # set radio back into RX mode
 
                 # print the payload received and the response's payload
@@ -161,7 +129,8 @@ class App:
                 else:
                     self.radio.flush_tx()
                     print("Response failed or timed out")
-                end_time = time.monotonic() + timeout  # reset the timeout timer
+                end_time = monotonic_ns() + timeout_ns  # reset the timeout timer
+                has_payload, pipe_number = available_pipe()
 
         # recommended behavior is to keep in TX mode while idle
         self.radio.as_tx()  # enter inactive TX mode
@@ -174,26 +143,18 @@ class App:
             - True when role is complete & app should continue running.
             - False when app should exit
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'R' for receiver role.\n"
                 "*** Enter 'T' for transmitter role.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
+            ),
+            {
+                "R": (self.rx, 1),
+                "T": (self.tx, 1),
+            },
         )
-        user_input = user_input.split()
-        if user_input[0].upper().startswith("R"):
-            self.rx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("T"):
-            self.tx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
 
 
 if __name__ == "__main__":
@@ -10,7 +10,13 @@ See documentation at https://nRF24.github.io/rf24-rs
 
 import struct
 import time
+from typing import List, Tuple
 from rf24_py import RF24, PaLevel
+from _common import run_role
+
+# "<ii" means 2x little endian signed int (the node number and a payload ID).
+# Compiling the format once avoids parsing it for every payload.
+NODE_PAYLOAD = struct.Struct("<ii")
 
 
 class App:
@@ -42,26 +48,31 @@ class App:
         # It is very helpful to think of an address as a path instead of as
         # an identifying device destination
 
+        # write the addresses to all pipes once. as_tx() only borrows pipe 0
+        # (for receiving ACKs), and as_rx() restores pipe 0's cached RX address.
+        for pipe, addr in enumerate(self.addresses):
+            self.radio.open_rx_pipe(pipe, addr)
+
         # set the Power Amplifier level to -12 dBm since this test example is
         # usually run with nRF24L01 transceivers in close proximity of each other
         self.radio.pa_level = PaLevel.Low  # PaLevel.Max is default
 
         # To save time during transmission, we'll set the payload size to be only what
-        # we need.
-        # 2 int occupy 8 bytes in memory using len(struct.pack())
-        # "<ii" means 2x little endian unsigned int
-        self.radio.payload_length = struct.calcsize("<ii")
+        # we need. 2 int occupy 8 bytes in memory.
+        self.radio.payload_length = NODE_PAYLOAD.size
 
         # for debugging
         # self.radio.print_details()
 
-    def tx(self, node_number: int = 0, count: int = 6):
+    def tx(self, node_number: int = 0, count: int = 6, delay_ms: int = 1000):
         """start transmitting to the base station.
 
         :param int node_number: the node's identifying index (from the
             the `addresses` list). This is a required parameter
         :param int count: the number of times that the node will transmit
             to the base station.
+        :param int delay_ms: the number of milliseconds to wait between
+            transmissions. Use 0 to transmit back-to-back.
         """
         # According to the datasheet, the auto-retry features's delay value should
         # be "skewed" to allow the RX node to receive 1 transmission at a time.
@@ -73,48 +84,70 @@ class App:
         # set the TX address to the address of the base station (always uses pipe 0).
         self.radio.as_tx(self.addresses[node_number])  # enter inactive TX mode
 
+        # results of back-to-back transmissions are printed after the last one,
+        # so the next transmission isn't held up by writing to the terminal
+        deferred_reports: List[Tuple[int, bool, int]] = []
         counter = 0
         # use the node_number to identify where the payload came from
         while counter < count:
             counter += 1
             # payloads will include the node_number and a payload ID character
-            payload = struct.pack("<ii", node_number, counter)
+            payload = NODE_PAYLOAD.pack(node_number, counter)
             start_timer = time.monotonic_ns()
             report = self.radio.send(payload)
-            end_timer = time.monotonic_ns()
-            # show something to see it isn't frozen
-            if report:
-                print(
-                    f"Transmission of payloadID {counter} as node {node_number}",
-                    f"successful! Transmission time: {(end_timer - start_timer) / 1000}",
-                    "us",
-                )
+            elapsed_ns = time.monotonic_ns() - start_timer
+            if delay_ms:
+                # show something to see it isn't frozen
+                self._print_report(node_number, counter, report, elapsed_ns)
+                time.sleep(delay_ms / 1000)  # slow down the test for readability
             else:
-                print("Transmission failed or timed out")
-            time.sleep(1)  # slow down the test for readability
+                deferred_reports.append((counter, report, elapsed_ns))
+        for payload_id, report, elapsed_ns in deferred_reports:
+            self._print_report(node_number, payload_id, report, elapsed_ns)
 
         # recommended behavior is to keep in TX mode while idle
         self.radio.as_tx()  # enter inactive TX mode
 
+    @staticmethod
+    def _print_report(node_number: int, payload_id: int, report: bool, elapsed_ns: int):
+        """Print the result of a transmission made by `tx()`."""
+        if report:
+            print(
+                f"Transmission of payloadID {payload_id} as node {node_number}",
+                f"successful! Transmission time: {elapsed_ns / 1000}",
+                "us",
+            )
+        else:
+            print("Transmission failed or timed out")
+
     def rx(self, timeout=10):
         """Use the nRF24L01 as a base station for listening to all nodes"""
-        # write the addresses to all pipes.
-        for pipe, addr in enumerate(self.addresses):
-            self.radio.open_rx_pipe(pipe, addr)
         self.radio.as_rx()  # put base station into RX mode
-        end_time = time.monotonic() + timeout  # start timer
-        while time.monotonic() < end_time:
-            has_payload, pipe_number = self.radio.available_pipe()
-            if has_payload:
-                data = self.radio.read()
+
+        monotonic_ns = time.monotonic_ns
+        available_pipe, read = (self.radio.available_pipe, self.radio.read)
+        unpack = NODE_PAYLOAD.unpack
+
+        timeout_ns = timeout * 1_000_000_000
+        end_time = monotonic_ns() + timeout_ns  # start timer
+        while monotonic_ns() < end_time:
+            # Busy-poll without napping. Nodes may transmit back-to-back (see tx()),
+            # and the 3-level RX FIFO can fill up while the receiver isn't polling.
+            # A full RX FIFO stops the receiver from ACKing, which the transmitting
+            # nodes would report as failures.
+            has_payload, pipe_number = available_pipe()
+            while has_payload:  # empty the RX FIFO before checking the timer again
+                data = read()
                 # unpack payload
-                node_id, payload_id = struct.unpack("<ii", data)
+                node_id, payload_id = unpack(data)
                 # show the pipe number that received the payload
                 print(
                     f"Received {len(data)} bytes on pipe {pipe_number} from node {node_id}.",
                     f"PayloadID: {payload_id}",
                 )
-                end_time = time.monotonic() + timeout  # reset timer with every payload
+                # reset timer with every payload
+                end_time = monotonic_ns() + timeout_ns
+                has_payload, pipe_number = available_pipe()
 
         # recommended behavior is to keep in TX mode while idle
         self.radio.as_tx()  # enter inactive TX mode
@@ -127,27 +160,20 @@ class App:
             - True when role is complete & app should continue running.
             - False when app should exit
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'R' for receiver role.\n"
                 "*** Enter 'T' for transmitter role.\n"
                 "    Use 'T n' to transmit as node n; n must be in range [0, 5].\n"
+                "    Use 'T n c d' to transmit c payloads with d milliseconds between them.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
+            ),
+            {
+                "R": (self.rx, 1),
+                "T": (self.tx, 3),
+            },
         )
-        user_input = user_input.split()
-        if user_input[0].upper().startswith("R"):
-            self.rx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("T"):
-            self.tx(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
 
 
 if __name__ == "__main__":
@@ -29,11 +29,26 @@ See documentation at https://nRF24.github.io/rf24-rs
 import time
 from typing import Optional
 from rf24_py import RF24, CrcLength, FifoState, DataRate
+from _common import run_role
 
 print(__file__)  # print example name
 
 MAX_CHANNELS = 126
 
+# The character printed for a channel's signal count (indexed by the count).
+# Counts are reset every 15 sweeps, so a single hexadecimal digit is enough.
+SIGNAL_COUNT_CHARS = b"-123456789ABCDEF"
+
+# The vertical header of channel numbers (read as columns) printed by scan()
+SCAN_HEADER = "\n".join(
+    [
+        "0" * 100 + "1" * 26,
+        "".join(str(i % 10) * (10 if i < 12 else 6) for i in range(13)),
+        "".join(str(i % 10) for i in range(MAX_CHANNELS)),
+        "~" * MAX_CHANNELS,
+    ]
+)
+
 
 class App:
     def __init__(self, data_rate: DataRate) -> None:
@@ -80,59 +95,63 @@ class App:
         :param int timeout: The number of seconds in which scanning is performed.
         """
         # print the vertical header of channel numbers
-        print("0" * 100 + "1" * 26)
-        for i in range(13):
-            print(str(i % 10) * (10 if i < 12 else 6), sep="", end="")
-        print("")  # endl
-        for i in range(126):
-            print(str(i % 10), sep="", end="")
-        print("\n" + "~" * 126)
-
-        signals = [0] * 126  # store the signal count for each channel
+        print(SCAN_HEADER)
+
+        # store the signal count for each channel.
+        # Counts never exceed 15 (see below), so 1 byte per channel is enough.
+        signals = bytearray(MAX_CHANNELS)
+        no_signals = bytes(MAX_CHANNELS)  # used to reset the counts in place
+        # the output for the current sweep; printed once the sweep is complete
+        row = bytearray(b"-" * MAX_CHANNELS)
         sweeps = 0  # keep track of the number of sweeps made through all channels
         curr_channel = 0
-        end_time = time.monotonic() + timeout  # start the timer
-        while time.monotonic() < end_time:
-            self.radio.channel = curr_channel
-            self.radio.as_rx()  # start a RX session
-            time.sleep(0.00013)  # wait 130 microseconds
-            rpd = self.radio.rpd
-            self.radio.as_tx()  # end the RX session
-
-            found_signal = self.radio.available()
-            if found_signal or rpd or self.radio.rpd:
+        # Configure RX mode once. Each channel's RX session is then started and
+        # ended by only toggling the CE pin, which avoids rewriting the CONFIG
+        # and address registers for every channel.
+        radio = self.radio
+        radio.as_rx()
+        radio.ce_pin(False)
+
+        monotonic_ns, sleep = (time.monotonic_ns, time.sleep)
+        ce_pin, available = (radio.ce_pin, radio.available)
+
+        end_time = monotonic_ns() + timeout * 1_000_000_000  # start the timer
+        while monotonic_ns() < end_time:
+            radio.channel = curr_channel  # only change channels while CE is LOW
+            ce_pin(True)  # start a RX session
+            sleep(0.00013)  # wait 130 microseconds
+            ce_pin(False)  # end the RX session
+            # without a received packet, RPD is latched when the RX session ends
+            rpd = radio.rpd
+
+            found_signal = available()
+            if found_signal or rpd:
                 # count signal as interference
                 signals[curr_channel] += 1
             if found_signal:
                 # discard any packets (noise) saved in RX FIFO
-                self.radio.flush_rx()
+                radio.flush_rx()
 
-            # output the signal counts per channel
-            sig_cnt = signals[curr_channel]
-            print(
-                ("%X" % sig_cnt) if sig_cnt else "-",
-                end="",
-                flush=curr_channel < (MAX_CHANNELS - 1),
-            )
+            # record the signal count for this channel
+            row[curr_channel] = SIGNAL_COUNT_CHARS[signals[curr_channel]]
 
-            endl = False
             curr_channel = curr_channel + 1
             if curr_channel >= MAX_CHANNELS:
                 curr_channel = 0
                 sweeps += 1
-            if sweeps >= 0x0F:
-                endl = True
-                sweeps = 0
-                # reset the signal counts for new line
-                signals = [0] * MAX_CHANNELS
-            if curr_channel == 0:
-                print("\n" if endl else "\r", end="", flush=True)
+                endl = sweeps >= 0x0F
+                # output the signal counts of the whole sweep at once
+                print(row.decode(), end="\n" if endl else "\r", flush=True)
+                if endl:
+                    sweeps = 0
+                    # reset the signal counts for new line
+                    signals[:] = no_signals
+        radio.as_tx()  # exit RX mode
 
         # finish printing results and end with a new line
         for channel in range(curr_channel, MAX_CHANNELS):
-            sig_cnt = signals[channel]
-            print(("%X" % sig_cnt) if sig_cnt else "-", end="")
-        print("")
+            row[channel] = SIGNAL_COUNT_CHARS[signals[channel]]
+        print(row.decode())
 
     def noise(self, timeout: float = 1, channel: Optional[int] = None):
         """print a stream of detected noise for duration of time.
@@ -142,46 +161,35 @@ class App:
             radio's current setting is used.
         """
 
-        def hex_data_str(data: bytes) -> str:
-            return " ".join(["%02x" % b for b in data])
-
         if channel is not None:
             self.radio.channel = channel
         self.radio.as_rx()
-        timeout += time.monotonic()
-        while time.monotonic() < timeout:
+        end_time = time.monotonic_ns() + int(timeout * 1_000_000_000)
+        while time.monotonic_ns() < end_time:
             signal = self.radio.read()
             if signal:
-                print(hex_data_str(signal))
+                print(signal.hex(" "))
         self.radio.as_tx()
         while self.radio.get_fifo_state(about_tx=False) != FifoState.Empty:
             # dump the left overs in the RX FIFO
-            print(hex_data_str(self.radio.read()))
+            print(self.radio.read().hex(" "))
 
     def set_role(self):
         """Set the role using stdin stream. Timeout arg for scan() can be
         specified using a space delimiter (e.g. 'S 10' calls `scan(10)`)
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'S' to perform scan.\n"
                 "*** Enter 'N' to display noise.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
+            ),
+            {
+                "S": (self.scan, 1),
+                "N": (self.noise, 2),
+            },
         )
-        user_input = user_input.split()
-        if user_input[0].upper().startswith("S"):
-            self.scan(*[int(x) for x in user_input[1:2]])
-            return True
-        if user_input[0].upper().startswith("N"):
-            self.noise(*[int(x) for x in user_input[1:3]])
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
 
 
 if __name__ == "__main__":
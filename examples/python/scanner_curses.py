@@ -9,7 +9,7 @@ See documentation at https://nRF24.github.io/rf24-rs
 
 import curses
 import time
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from rf24_py import RF24, DataRate, CrcLength
 
 print(__file__)  # print example name
@@ -36,6 +36,11 @@ OFFERED_DATA_RATES = ["1 Mbps", "2 Mbps", "250 kbps"]
 AVAILABLE_RATES = [DataRate.Mbps1, DataRate.Mbps2, DataRate.Kbps250]
 TOTAL_CHANNELS = 126
 CACHE_MAX = 5  # the depth of history to calculate peaks
+# the minimum number of nanoseconds between screen refreshes (about 30 per second)
+REFRESH_INTERVAL = 1_000_000_000 // 30
+
+# The label drawn for a signal count (indexed by the count clamped to 0xF).
+SIGNAL_COUNT_LABELS = (" - ",) + tuple(f" {i:X} " for i in range(1, 16))
 
 # To detect noise, we'll use the worst addresses possible (a reverse engineering
 # tactic). These addresses are designed to confuse the radio into thinking that the
@@ -52,8 +57,12 @@ noise_address = [
 
 class ChannelHistory:
     def __init__(self) -> None:
-        #: FIFO for tracking peak decays
-        self._history: List[bool] = [False] * CACHE_MAX
+        #: circular buffer for tracking peak decays
+        self._history = bytearray(CACHE_MAX)
+        #: the index of the oldest value in `_history`
+        self._index: int = 0
+        #: the sum of values in `_history`
+        self._cached_sum: int = 0
         #: for the total signal counts
         self.total: int = 0
 
@@ -61,14 +70,20 @@ class ChannelHistory:
         """Push a scan result's value into history while returning the sum of cached
         signals found. This function also increments the total signal count accordingly.
         """
-        self._history = self._history[1:] + [value]
+        index = self._index
+        self._cached_sum += value - self._history[index]
+        self._history[index] = value
+        self._index = (index + 1) % CACHE_MAX
         self.total += value
-        return self._history.count(True)
+        return self._cached_sum
 
 
 #: An array of histories for each channel
 stored = [ChannelHistory() for _ in range(TOTAL_CHANNELS)]
 
+#: The curses attributes for each color pair (populated by `init_curses()`)
+COLOR_PAIRS: Dict[int, int] = {}
+
 
 class ProgressBar:
     """This represents a progress bar using a curses window object."""
@@ -83,51 +98,56 @@ class ProgressBar:
         color: int,
     ):
         self.x, self.y, self.width, self.win, self.color = (x, y, cols, std_scr, color)
+        self.attr = COLOR_PAIRS[color]  # the curses attribute for the bar's color
+        #: the (completed, clamped signal count) last drawn by `update()`
+        self._last_state = (-1, -1)
+        bar_len = self.width - 8
+        #: the number of filled columns (rounded up) for each possible cached sum
+        self._filled_cols = tuple(
+            min(bar_len, -(-bar_len * c // CACHE_MAX)) for c in range(CACHE_MAX + 1)
+        )
         self.win.move(self.y, self.x)
-        self.win.attron(curses.color_pair(self.color))
+        self.win.attron(self.attr)
         self.win.addstr(label)  # always labeled in MHz (4 digits)
         for _ in range(self.width - 8):  # draw the empty bar
             self.win.addch(curses.ACS_HLINE)
         self.win.addstr(" - ")  # draw the initial signal count
-        self.win.attroff(curses.color_pair(self.color))
+        self.win.attroff(self.attr)
 
     def update(self, completed: int, signal_count: int):
         """Update the progress bar."""
-        count = " - "
-        if signal_count:
-            count = " %X " % min(0xF, signal_count)
-        filled = (self.width - 8) * completed / CACHE_MAX
+        state = (completed, min(0xF, signal_count))
+        if state == self._last_state:
+            return  # nothing displayed would change
+        self._last_state = state
+        count = SIGNAL_COUNT_LABELS[state[1]]
+        bar_len = self.width - 8
+        filled = self._filled_cols[completed]
         offset_x = 5
-        self.win.move(self.y, self.x + offset_x)
-        for i in range(offset_x, self.width - 3):
-            bar_filled = i < (filled + offset_x)
-            bar_color = 5 if bar_filled else self.color
-            self.win.attron(curses.color_pair(bar_color))
-            self.win.addch("=" if bar_filled else curses.ACS_HLINE)
-            self.win.attroff(curses.color_pair(bar_color))
-        self.win.attron(curses.color_pair(self.color))
-        self.win.addstr(count)
-        self.win.attroff(curses.color_pair(self.color))
+        # The filled part of the bar is always on the left. So, draw the bar as
+        # (at most) 2 runs of characters instead of 1 column at a time.
+        self.win.addstr(self.y, self.x + offset_x, "=" * filled, COLOR_PAIRS[5])
+        if filled < bar_len:
+            # hline() draws from the cursor without moving it
+            self.win.hline(curses.ACS_HLINE | self.attr, bar_len - filled)
+        self.win.addstr(self.y, self.x + offset_x + bar_len, count, self.attr)
 
 
 def init_display(window) -> List[ProgressBar]:
     """Creates a table of progress bars (1 for each channel)."""
-    progress_bars: List[ProgressBar] = [
-        ProgressBar(0, 0, 0, window, "", 0)
-    ] * TOTAL_CHANNELS
     bar_w = int(curses.COLS / 6)
-    for i in range(21):  # 21 rows
-        for j in range(i, i + (21 * 6), 21):  # 6 columns
-            color = 7 if int(j / 21) % 2 else 3
-            progress_bars[j] = ProgressBar(
-                x=bar_w * int(j / 21),
-                y=i + 3,
-                cols=bar_w,
-                std_scr=window,
-                label=f"{2400 + (j)} ",
-                color=color,
-            )
-    return progress_bars
+    # 6 columns of 21 rows; channels are listed top-to-bottom in each column
+    return [
+        ProgressBar(
+            x=bar_w * (j // 21),
+            y=(j % 21) + 3,
+            cols=bar_w,
+            std_scr=window,
+            label=f"{2400 + (j)} ",
+            color=7 if (j // 21) % 2 else 3,
+        )
+        for j in range(TOTAL_CHANNELS)
+    ]
 
 
 def init_radio():
@@ -138,9 +158,13 @@ def init_radio():
     radio.address_length = 2
     for pipe, address in enumerate(noise_address):
         radio.open_rx_pipe(pipe, address)
+    # Stay configured for RX mode. Each channel's RX session is then started and
+    # ended by only toggling the CE pin (see scan_channel()), which avoids
+    # rewriting the CONFIG and address registers for every channel.
+    # begin() already flushed the RX FIFO, and CE is not held HIGH long enough
+    # (less than the 130 microsecond RX settling time) to receive anything.
     radio.as_rx()
-    radio.as_tx()
-    radio.flush_rx()
+    radio.ce_pin(False)
 
 
 def init_curses():
@@ -153,6 +177,8 @@ def init_curses():
     curses.init_pair(3, curses.COLOR_YELLOW, -1)
     curses.init_pair(5, curses.COLOR_MAGENTA, -1)
     curses.init_pair(7, curses.COLOR_WHITE, -1)
+    for pair in (3, 5, 7):
+        COLOR_PAIRS[pair] = curses.color_pair(pair)
     return std_scr
 
 
@@ -194,12 +220,18 @@ def get_user_input() -> Tuple[int, int]:
 
 def scan_channel(channel: int) -> bool:
     """Scan a specified channel and report if a signal was detected."""
-    radio.channel = channel
-    radio.as_rx()
-    time.sleep(0.00013)
+    radio.channel = channel  # only change channels while CE is LOW
+    radio.ce_pin(True)  # start a RX session
+    # RPD is only valid after the radio settles into RX mode (130 microseconds)
+    # plus the AGC delay (40 microseconds). time.sleep() can oversleep such a
+    # short delay by hundreds of microseconds, so spin on the clock instead.
+    settled = time.monotonic_ns() + 170_000
+    while time.monotonic_ns() < settled:
+        pass
+    radio.ce_pin(False)  # end the RX session
+    # without a received packet, RPD is latched when the RX session ends
     found_signal = radio.rpd
-    radio.as_tx()
-    if found_signal or radio.rpd or radio.available():
+    if found_signal or radio.available():
         radio.flush_rx()
         return True
     return False
@@ -218,14 +250,26 @@ def main():
         std_scr.addstr(1, 0, "Signal counts are clamped to a single hexadecimal digit.")
         bars = init_display(std_scr)
         channel, val = (0, False)
-        end_time = time.monotonic() + duration
-        while time.monotonic() < end_time:
-            std_scr.addstr(2, 0, timer_prompt.format(int(end_time - time.monotonic())))
+        next_refresh = 0
+        last_remaining = -1  # the countdown (in seconds) last drawn
+        monotonic_ns = time.monotonic_ns
+        end_time = monotonic_ns() + duration * 1_000_000_000
+        while monotonic_ns() < end_time:
             val = scan_channel(channel)
             cache_sum = stored[channel].push(val)
             if stored[channel].total:
                 bars[channel].update(cache_sum, stored[channel].total)
-                std_scr.refresh()
+            # Writing to the terminal is much slower than scanning a channel.
+            # So, only push the accumulated changes to the screen at a limited rate.
+            now = monotonic_ns()
+            if now >= next_refresh:
+                remaining = (end_time - now) // 1_000_000_000
+                if remaining != last_remaining:  # only changes once per second
+                    std_scr.addstr(2, 0, timer_prompt.format(remaining))
+                    last_remaining = remaining
+                std_scr.noutrefresh()
+                curses.doupdate()
+                next_refresh = now + REFRESH_INTERVAL
             if channel + 1 == TOTAL_CHANNELS:
                 channel = 0
                 spectrum_passes += 1
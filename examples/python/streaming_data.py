@@ -11,69 +11,51 @@ transmitting the stream.
 See documentation at https://nRF24.github.io/rf24-rs
 """
 
+from functools import lru_cache
 import time
-from rf24_py import RF24, PaLevel, StatusFlags, FifoState
+from rf24_py import StatusFlags, FifoState
+from _common import ask_radio_number, make_radio, run_role
 
+# compared against on every poll of the TX FIFO while waiting for it to empty
+_FIFO_EMPTY = FifoState.Empty
 
-def make_payloads(size: int = 32) -> list[bytes]:
-    """return a list of payloads"""
-    # we'll use `size` for the number of payloads in the list and the
+
+@lru_cache(maxsize=4)
+def make_payloads(size: int = 32) -> tuple[bytes, ...]:
+    """return a tuple of payloads.
+
+    The result is cached because repeated calls with the same `size` always
+    produce the same stream.
+    """
+    # we'll use `size` for the number of payloads in the tuple and the
     # payloads' length
     stream = []
+    max_len = size - 1
+    half_size = int(max_len / 2)
     for i in range(size):
+        payload = bytearray(b"1" * size)  # allocate the whole payload at once
         # prefix payload with a sequential letter to indicate which
         # payloads were lost (if any)
-        buff = bytes([i + (65 if 0 <= i < 26 else 71)])
-        max_len = size - 1
-        half_size = int(max_len / 2)
+        payload[0] = i + (65 if 0 <= i < 26 else 71)
+        # the rest of the payload is a run of "0"s between runs of "1"s;
+        # the run of "0"s shrinks toward the middle of the stream and vanishes there
         abs_diff = abs(half_size - i)
-        for j in range(max_len):
-            char = bool(j >= half_size + abs_diff)
-            char |= bool(j < half_size - abs_diff)
-            buff += bytes([char + 48])
-        stream.append(buff)
-    return stream
+        ones = min(max(half_size - abs_diff, 0), max_len)  # leading "1"s
+        zeros = min(half_size + abs_diff, max_len) - ones
+        payload[1 + ones : 1 + ones + zeros] = b"0" * zeros
+        stream.append(bytes(payload))
+    return tuple(stream)
 
 
 class App:
     def __init__(self) -> None:
-        # The radio's CE Pin uses a GPIO number.
-        ce_pin = 22  # for GPIO22
-
-        # The radio's CSN Pin corresponds the SPI bus's CS pin (aka CE pin).
-        # On Linux, consider the device path `/dev/spidev<a>.<b>`:
-        #   - `<a>` is the SPI bus number (defaults to `0`)
-        #   - `<b>` is the CSN pin (must be unique for each device on the same SPI bus)
-        csn_pin = 0  # aka CE0 for SPI bus 0 (/dev/spidev0.0)
-
-        # create a radio object for the specified hardware config:
-        self.radio = RF24(ce_pin, csn_pin)
-
-        # For this example, we will use different addresses
-        # An address need to be a buffer protocol object (bytearray)
-        address = [b"1Node", b"2Node"]
-        # It is very helpful to think of an address as a path instead of as
-        # an identifying device destination
-
         # to use different addresses on a pair of radios, we need a variable to
         # uniquely identify which address this radio will use to transmit
-        # 0 uses address[radio_number] to transmit, 1 uses address[not radio_number] to transmit
-        radio_number = bool(
-            int(input("Which radio is this? Enter '0' or '1'. Defaults to '0' ") or 0)
-        )
-
-        # initialize the nRF24L01 on the spi bus
-        self.radio.begin()
+        radio_number = ask_radio_number()
 
-        # set the Power Amplifier level to -12 dBm since this test example is
-        # usually run with nRF24L01 transceivers in close proximity of each other
-        self.radio.pa_level = PaLevel.Low  # PaLevel.Max is default
-
-        # set TX address of RX node (always uses pipe 0)
-        self.radio.as_tx(address[radio_number])  # enter inactive TX mode
-
-        # set RX address of TX node into an RX pipe
-        self.radio.open_rx_pipe(1, address[not radio_number])  # using pipe 1
+        # create and configure the radio object.
+        # The payload length is set by tx() or rx() according to the stream's size.
+        self.radio = make_radio(radio_number)
 
     def tx(self, count: int = 1, size: int = 32):
         """Uses all 3 levels of the TX FIFO via `RF24::write()`"""
@@ -88,15 +70,22 @@ class App:
         stream = make_payloads(size)
 
         self.radio.as_tx()  # ensures the nRF24L01 is in TX mode
+
+        write, rewrite = (self.radio.write, self.radio.rewrite)
+        get_status_flags, get_fifo_state = (
+            self.radio.get_status_flags,
+            self.radio.get_fifo_state,
+        )
+
         for _ in range(count):  # transmit the same payloads this many times
             self.radio.flush_tx()  # clear the TX FIFO so we can use all 3 levels
             failures = 0  # keep track of manual retries
-            start_timer = time.monotonic() * 1000  # start timer
+            start_timer = time.monotonic_ns()  # start timer
             for buf in stream:  # cycle through all payloads in stream
-                while not self.radio.write(buf):
+                while not write(buf):
                     # upload to TX FIFO failed because TX FIFO is full.
                     # check for transmission errors
-                    flags: StatusFlags = self.radio.get_status_flags()
+                    flags: StatusFlags = get_status_flags()
                     if flags.tx_df:  # a transmission failed
                         failures += 1  # increment manual retry count
                         if failures > 99:
@@ -106,21 +95,19 @@ class App:
                             break  # receiver radio seems unresponsive
 
                         # rewrite() resets the tx_df flag and reuses top level of TX FIFO
-                        self.radio.rewrite()
-                    if failures > 99:
-                        break
+                        rewrite()
                 if failures > 99:
                     break
             # wait for radio to finish transmitting everything in the TX FIFO
-            while failures < 99 and self.radio.get_fifo_state(True) != FifoState.Empty:
+            while failures < 99 and get_fifo_state(True) != _FIFO_EMPTY:
                 # get_fifo_state() also update()s the StatusFlags
-                flags = self.radio.get_status_flags()
+                flags = get_status_flags()
                 if flags.tx_df:
                     failures += 1
-                    self.radio.rewrite()
-            end_timer = time.monotonic() * 1000  # end timer
+                    rewrite()
+            end_timer = time.monotonic_ns()  # end timer
             print(
-                f"Transmission took {end_timer - start_timer} ms with",
+                f"Transmission took {(end_timer - start_timer) // 1_000_000} ms with",
                 f"{failures} failures detected.",
             )
 
@@ -136,14 +123,26 @@ class App:
 
         self.radio.as_rx()  # put radio into active RX mode
         count = 0  # keep track of the number of received payloads
-        end_time = time.monotonic() + timeout  # start timer
-        while time.monotonic() < end_time:
-            if self.radio.available():
+
+        monotonic_ns = time.monotonic_ns
+        available, read = (self.radio.available, self.radio.read)
+
+        timeout_ns = timeout * 1_000_000_000
+        # Writing to the terminal is slow compared to reading the RX FIFO.
+        # So, output is collected while the RX FIFO is emptied and printed at once.
+        output: list[str] = []
+        end_time = monotonic_ns() + timeout_ns  # start timer
+        while monotonic_ns() < end_time:
+            while available():  # empty the RX FIFO before checking the timer again
                 count += 1
                 # retrieve the received packet's payload
-                receive_payload = self.radio.read(size)
-                print(f"Received: {repr(receive_payload)} - {count}")
-                end_time = time.monotonic() + timeout  # reset timer on every RX payload
+                receive_payload = read(size)
+                output.append(f"Received: {repr(receive_payload)} - {count}")
+                # reset timer on every RX payload
+                end_time = monotonic_ns() + timeout_ns
+            if output:
+                print("\n".join(output))
+                output.clear()
 
         # recommended behavior is to keep in TX mode while idle
         self.radio.as_tx()  # enter inactive TX mode
@@ -156,26 +155,18 @@ class App:
             - True when role is complete & app should continue running.
             - False when app should exit
         """
-        user_input = (
-            input(
+        return run_role(
+            self.radio,
+            (
                 "*** Enter 'R' for receiver role.\n"
                 "*** Enter 'T' for transmitter role.\n"
                 "*** Enter 'Q' to quit example.\n"
-            )
-            or "?"
+            ),
+            {
+                "R": (self.rx, 2),
+                "T": (self.tx, 2),
+            },
         )
-        user_input = user_input.split()
-        if user_input[0].upper().startswith("R"):
-            self.rx(*[int(x) for x in user_input[1:3]])
-            return True
-        if user_input[0].upper().startswith("T"):
-            self.tx(*[int(x) for x in user_input[1:3]])
-            return True
-        if user_input[0].upper().startswith("Q"):
-            self.radio.power = False
-            return False
-        print(user_input[0], "is an unrecognized input. Please try again.")
-        return True
 
 
 if __name__ == "__main__":